@@ -1,3 +1,8 @@
+import argparse
+import multiprocessing
+import os
+from typing import Optional
+
 from flask_openapi3 import OpenAPI, Info, Tag
 from flask import jsonify
 from pydantic import BaseModel, Field, validator
@@ -62,6 +67,31 @@ class Translation(BaseModel):
         return v
 
 
+# offset/limit are counted in nucleotides of the submitted sequence for the
+# DNA, RNA and cDNA routes, and in amino-acid residues for /Polypeptide/v2/
+class WindowQuery(BaseModel):
+    offset: int = Field(0, ge=0, description="Start of the window (0-based)")
+    limit: Optional[int] = Field(
+        None, ge=1, description="Size of the window (default: to the end)"
+    )
+
+
+class RNAWindowQuery(RNAQuery, WindowQuery):
+    pass
+
+
+class DNAWindowQuery(DNAQuery, WindowQuery):
+    pass
+
+
+class CDNAWindowQuery(CDNAQuery, WindowQuery):
+    pass
+
+
+class TranslationWindowQuery(Translation, WindowQuery):
+    pass
+
+
 rna_tag = Tag(
     name="RNA Transcription from the Reverse Complement of a DNA Sequence",
     description="DNA Transcription to mRNA",
@@ -79,6 +109,35 @@ aminoacid_tag = Tag(
 )
 
 
+# complement, transcription and reverse transcription are position-local, so a
+# window of the result only needs the same window of the input sequence
+def get_window(sequence, offset, limit):
+    if limit is None:
+        return sequence[offset:]
+    return sequence[offset : offset + limit]
+
+
+# shared by the DNA, RNA and cDNA v2 routes, which only differ in the transform
+# and the response keys; without offset/limit the response is the same as v1
+def windowed_response(sequence, query, transform, error_key, result_key):
+    if query.offset == 0 and query.limit is None:
+        return jsonify({"Original": sequence, result_key: transform(sequence)})
+    if query.offset >= len(sequence):
+        return jsonify({error_key: "Offset is beyond the end of the sequence"}), 400
+    window = get_window(sequence, query.offset, query.limit)
+    return jsonify(
+        {
+            "Original": window,
+            result_key: transform(window),
+            "Window": {
+                "offset": query.offset,
+                "length": len(window),
+                "total": len(sequence),
+            },
+        }
+    )
+
+
 # 5’-ATGC-3’ in a double stranded DNA has a complement 3’-TACG-5’
 # RNA Polymerase enzyme only transcribe 5-to-3 so uses template strand 3’-TACG-5’ for transcription of ’5-AUGC-3’
 # *** here’s the catch ***
@@ -123,76 +182,92 @@ def get_complementary_dna(sequence):
     return Complementary_DNA
 
 
-def get_translate_mrna(mrna_sequence):
-    codon_translation = {
-        "UUU": "Phenylalanine",
-        "UUC": "Phenylalanine",
-        "UUA": "Leucine",
-        "UUG": "Leucine",
-        "CUU": "Leucine",
-        "CUC": "Leucine",
-        "CUA": "Leucine",
-        "CUG": "Leucine",
-        "AUU": "Isoleucine",
-        "AUC": "Isoleucine",
-        "AUA": "Isoleucine",
-        "AUG": "Methionine",
-        "GUU": "Valine",
-        "GUC": "Valine",
-        "GUA": "Valine",
-        "GUG": "Valine",
-        "UCU": "Serine",
-        "UCC": "Serine",
-        "UCA": "Serine",
-        "UCG": "Serine",
-        "CCU": "Proline",
-        "CCC": "Proline",
-        "CCA": "Proline",
-        "CCG": "Proline",
-        "ACU": "Threonine",
-        "ACC": "Threonine",
-        "ACA": "Threonine",
-        "ACG": "Threonine",
-        "GCU": "Alanine",
-        "GCC": "Alanine",
-        "GCA": "Alanine",
-        "GCG": "Alanine",
-        "UAU": "Tyrosine",
-        "UAC": "Tyrosine",
-        "UAA": "Stop",
-        "UAG": "Stop",
-        "CAU": "Histidine",
-        "CAC": "Histidine",
-        "CAA": "Glutamine",
-        "CAG": "Glutamine",
-        "AAU": "Asparagine",
-        "AAC": "Asparagine",
-        "AAA": "Lysine",
-        "AAG": "Lysine",
-        "GAU": "Aspartic Acid",
-        "GAC": "Aspartic Acid",
-        "GAA": "Glutamic Acid",
-        "GAG": "Glutamic Acid",
-        "UGU": "Cysteine",
-        "UGC": "Cysteine",
-        "UGA": "Stop",
-        "UGG": "Tryptophan",
-        "CGU": "Arginine",
-        "CGC": "Arginine",
-        "CGA": "Arginine",
-        "CGG": "Arginine",
-        "AGU": "Serine",
-        "AGC": "Serine",
-        "AGA": "Arginine",
-        "AGG": "Arginine",
-        "GGU": "Glycine",
-        "GGC": "Glycine",
-        "GGA": "Glycine",
-        "GGG": "Glycine",
-    }
-
-    stop_codons = {"UAA", "UAG", "UGA"}
-
+# The codon table is built once at import time rather than on every request,
+# so a pre-forking server that preloads this module shares it across workers
+CODON_TRANSLATION = {
+    "UUU": "Phenylalanine",
+    "UUC": "Phenylalanine",
+    "UUA": "Leucine",
+    "UUG": "Leucine",
+    "CUU": "Leucine",
+    "CUC": "Leucine",
+    "CUA": "Leucine",
+    "CUG": "Leucine",
+    "AUU": "Isoleucine",
+    "AUC": "Isoleucine",
+    "AUA": "Isoleucine",
+    "AUG": "Methionine",
+    "GUU": "Valine",
+    "GUC": "Valine",
+    "GUA": "Valine",
+    "GUG": "Valine",
+    "UCU": "Serine",
+    "UCC": "Serine",
+    "UCA": "Serine",
+    "UCG": "Serine",
+    "CCU": "Proline",
+    "CCC": "Proline",
+    "CCA": "Proline",
+    "CCG": "Proline",
+    "ACU": "Threonine",
+    "ACC": "Threonine",
+    "ACA": "Threonine",
+    "ACG": "Threonine",
+    "GCU": "Alanine",
+    "GCC": "Alanine",
+    "GCA": "Alanine",
+    "GCG": "Alanine",
+    "UAU": "Tyrosine",
+    "UAC": "Tyrosine",
+    "UAA": "Stop",
+    "UAG": "Stop",
+    "CAU": "Histidine",
+    "CAC": "Histidine",
+    "CAA": "Glutamine",
+    "CAG": "Glutamine",
+    "AAU": "Asparagine",
+    "AAC": "Asparagine",
+    "AAA": "Lysine",
+    "AAG": "Lysine",
+    "GAU": "Aspartic Acid",
+    "GAC": "Aspartic Acid",
+    "GAA": "Glutamic Acid",
+    "GAG": "Glutamic Acid",
+    "UGU": "Cysteine",
+    "UGC": "Cysteine",
+    "UGA": "Stop",
+    "UGG": "Tryptophan",
+    "CGU": "Arginine",
+    "CGC": "Arginine",
+    "CGA": "Arginine",
+    "CGG": "Arginine",
+    "AGU": "Serine",
+    "AGC": "Serine",
+    "AGA": "Arginine",
+    "AGG": "Arginine",
+    "GGU": "Glycine",
+    "GGC": "Glycine",
+    "GGA": "Glycine",
+    "GGG": "Glycine",
+}
+
+STOP_CODONS = {"UAA", "UAG", "UGA"}
+
+
+# number of residues translated before the first in-frame stop codon
+# (or the end of the sequence); this only checks codons against STOP_CODONS
+def get_polypeptide_length(mrna_sequence):
+    for i in range(0, len(mrna_sequence) - 2, 3):
+        if mrna_sequence[i : i + 3] in STOP_CODONS:
+            return i // 3
+    return len(mrna_sequence) // 3
+
+
+# offset/limit select residues of the polypeptide; only the codons of that
+# window are translated, the rest are just scanned for the first stop codon
+# When a window is requested the result also carries the polypeptide's "total"
+# length, so callers don't have to scan for the stop codon again
+def get_translate_mrna(mrna_sequence, offset=0, limit=None):
     mrna_sequence = mrna_sequence.upper().strip()
 
     if not all(n in "UCAG" for n in mrna_sequence):
@@ -204,12 +279,16 @@ def get_translate_mrna(mrna_sequence):
     if not mrna_sequence.startswith("AUG"):
         return {"error": "mRNA sequence must start with AUG (start codon)."}
 
+    total = get_polypeptide_length(mrna_sequence)
+    if offset > 0 and offset >= total:
+        return {"error": "Offset is beyond the end of the polypeptide.", "total": total}
+
+    end = total if limit is None else min(total, offset + limit)
+
     polypeptide = []
-    for i in range(0, len(mrna_sequence), 3):
+    for i in range(offset * 3, end * 3, 3):
         codon = mrna_sequence[i : i + 3]
-        if codon in stop_codons:
-            break
-        amino_acid = codon_translation.get(codon)
+        amino_acid = CODON_TRANSLATION.get(codon)
         if not amino_acid:
             return {"error": f"Invalid codon {codon} found."}
         polypeptide.append(amino_acid)
@@ -217,6 +296,9 @@ def get_translate_mrna(mrna_sequence):
     if not polypeptide:
         return {"error": "No amino acids translated before encountering stop codon."}
 
+    if offset > 0 or limit is not None:
+        return {"polypeptide": polypeptide, "length": len(polypeptide), "total": total}
+
     return {"polypeptide": polypeptide, "length": len(polypeptide)}
 
 
@@ -316,9 +398,21 @@ def myDNAAPI(query: DNAQuery):
             "description": "ComplemetaryDNA reverse transcription",
             "content": {
                 "application/json": {
-                    "example": {
-                        "Original": "AUGC",
-                        "Double_Stranded_CDNA": " 5'-ATGC-3' and 3'-TACG-5' ",
+                    "examples": {
+                        "full": {
+                            "value": {
+                                "Original": "AUGC",
+                                "Double_Stranded_CDNA": " 5'-ATGC-3' and 3'-TACG-5' ",
+                            }
+                        },
+                        "window": {
+                            "summary": "offset=1&limit=2",
+                            "value": {
+                                "Original": "UG",
+                                "Double_Stranded_CDNA": " 5'-TG-3' paired with 3'-AC-5' ",
+                                "Window": {"offset": 1, "length": 2, "total": 4},
+                            },
+                        },
                     }
                 }
             },
@@ -326,17 +420,27 @@ def myDNAAPI(query: DNAQuery):
         "400": {
             "description": "Error",
             "content": {
-                "application/json": {"example": {"CDNA error": "No Sequence Provided"}}
+                "application/json": {
+                    "examples": {
+                        "missing": {"value": {"CDNA error": "No Sequence Provided"}},
+                        "offset": {
+                            "value": {
+                                "CDNA error": "Offset is beyond the end of the sequence"
+                            }
+                        },
+                    }
+                }
             },
         },
     },
 )
-def myCDNAAPI_v2(query: CDNAQuery):
+def myCDNAAPI_v2(query: CDNAWindowQuery):
     sequence = query.seq
     if not sequence:
         return jsonify({"CDNA error": "No Sequenc Provided"}), 400
-    result = get_complementary_dna(sequence)
-    return jsonify({"Original": sequence, "Double_Stranded_CDNA": result})
+    return windowed_response(
+        sequence, query, get_complementary_dna, "CDNA error", "Double_Stranded_CDNA"
+    )
 
 
 @app.get(
@@ -347,24 +451,46 @@ def myCDNAAPI_v2(query: CDNAQuery):
             "description": "RNA transcription",
             "content": {
                 "application/json": {
-                    "example": {"Original": "ATGC", "RNA_Transcription": "AUGC"}
+                    "examples": {
+                        "full": {
+                            "value": {"Original": "ATGC", "RNA_Transcription": "AUGC"}
+                        },
+                        "window": {
+                            "summary": "offset=1&limit=2",
+                            "value": {
+                                "Original": "TG",
+                                "RNA_Transcription": " 5'-UG-3' ",
+                                "Window": {"offset": 1, "length": 2, "total": 4},
+                            },
+                        },
+                    }
                 }
             },
         },
         "400": {
             "description": "Error",
             "content": {
-                "application/json": {"example": {"RNA error": "No Sequence Provided"}}
+                "application/json": {
+                    "examples": {
+                        "missing": {"value": {"RNA error": "No Sequence Provided"}},
+                        "offset": {
+                            "value": {
+                                "RNA error": "Offset is beyond the end of the sequence"
+                            }
+                        },
+                    }
+                }
             },
         },
     },
 )
-def myRNAAPI_v2(query: RNAQuery):
+def myRNAAPI_v2(query: RNAWindowQuery):
     sequence = query.seq
     if not sequence:
         return jsonify({"RNA error": "No Sequenc Provided"}), 400
-    result = get_rna_transcription(sequence)
-    return jsonify({"Original": sequence, "RNA_Transcription": result})
+    return windowed_response(
+        sequence, query, get_rna_transcription, "RNA error", "RNA_Transcription"
+    )
 
 
 @app.get(
@@ -375,24 +501,48 @@ def myRNAAPI_v2(query: RNAQuery):
             "description": "DNA pair complement",
             "content": {
                 "application/json": {
-                    "example": {"Original": "ATGC", "Reverse_Complement": "GCAT"}
+                    "examples": {
+                        "full": {
+                            "value": {"Original": "ATGC", "Reverse_Complement": "GCAT"}
+                        },
+                        "window": {
+                            "summary": "offset=1&limit=2",
+                            "value": {
+                                "Original": "TG",
+                                "Reverse_Complement": " 5'-CA-3' ",
+                                "Window": {"offset": 1, "length": 2, "total": 4},
+                            },
+                        },
+                    }
                 }
             },
         },
         "400": {
             "description": "Error",
             "content": {
-                "application/json": {"example": {"DNA error": "No Sequence Provided"}}
+                "application/json": {
+                    "examples": {
+                        "missing": {"value": {"DNA error": "No Sequence Provided"}},
+                        "offset": {
+                            "value": {
+                                "DNA error": "Offset is beyond the end of the sequence"
+                            }
+                        },
+                    }
+                }
             },
         },
     },
 )
-def myDNAAPI_v2(query: DNAQuery):
+def myDNAAPI_v2(query: DNAWindowQuery):
     sequence = query.seq
     if not sequence:
         return jsonify({"DNA error": "No Sequence Provided"}), 400
-    result = get_dna_template_strand(sequence)
-    return jsonify({"Original": sequence, "Reverse_Complement": result})
+    # the window is taken on the coding strand, so the reverse complement
+    # returned is the template strand paired with that same region
+    return windowed_response(
+        sequence, query, get_dna_template_strand, "DNA error", "Reverse_Complement"
+    )
 
 
 @app.get(
@@ -403,11 +553,26 @@ def myDNAAPI_v2(query: DNAQuery):
             "description": "Chain of peptide links",
             "content": {
                 "application/json": {
-                    "example": {
-                        "Codon": "AUGGCCAAGUAA",
-                        "Polypeptide": {
-                            "polypeptide": ["Methionine", "Alanine", "Lysine"],
-                            "length": 3,
+                    "examples": {
+                        "full": {
+                            "value": {
+                                "Codon": "AUGGCCAAGUAA",
+                                "Polypeptide": {
+                                    "polypeptide": ["Methionine", "Alanine", "Lysine"],
+                                    "length": 3,
+                                },
+                            }
+                        },
+                        "window": {
+                            "summary": "offset=1&limit=5",
+                            "value": {
+                                "Codon": "GCCAAG",
+                                "Polypeptide": {
+                                    "polypeptide": ["Alanine", "Lysine"],
+                                    "length": 2,
+                                },
+                                "Window": {"offset": 1, "length": 2, "total": 3},
+                            },
                         },
                     }
                 }
@@ -417,19 +582,150 @@ def myDNAAPI_v2(query: DNAQuery):
             "description": "Error",
             "content": {
                 "application/json": {
-                    "example": {"Amino error": "No mRNA Sequence Provided"}
+                    "examples": {
+                        "missing": {
+                            "value": {"mRNA error": "No mRNA Sequence Provided"}
+                        },
+                        "offset": {
+                            "value": {
+                                "mRNA error": "Offset is beyond the end of the polypeptide."
+                            }
+                        },
+                    }
                 }
             },
         },
     },
 )
-def myPolypeptideAPI_v2(query: Translation):
+def myPolypeptideAPI_v2(query: TranslationWindowQuery):
     sequence = query.seq
     if not sequence:
         return jsonify({"mRNA error": "No mRNA Sequence Provided"}), 400
-    result = get_translate_mrna(sequence)
-    return jsonify({"Codon": sequence, "Polypeptide": result})
+    if query.offset == 0 and query.limit is None:
+        result = get_translate_mrna(sequence)
+        return jsonify({"Codon": sequence, "Polypeptide": result})
+    result = get_translate_mrna(sequence, query.offset, query.limit)
+    if "total" not in result:
+        return jsonify({"Codon": sequence, "Polypeptide": result})
+    total = result.pop("total")
+    if query.offset >= total:
+        return jsonify({"mRNA error": result["error"]}), 400
+    # echo only the codons of the translated residues rather than the whole mRNA
+    codons = get_window(sequence, query.offset * 3, result["length"] * 3)
+    return jsonify(
+        {
+            "Codon": codons,
+            "Polypeptide": result,
+            "Window": {
+                "offset": query.offset,
+                "length": result["length"],
+                "total": total,
+            },
+        }
+    )
+
+
+# =============serving=========================================================
+# `python Translation_transcription.py serve` runs a pre-forking gunicorn server
+# instead of Werkzeug's debug server (plain `python Translation_transcription.py`
+# still starts the debug server for local development)
+# The app and codon table are loaded in the parent before forking (preload_app)
+# so every worker shares them copy-on-write, and each worker sends one synthetic
+# request to every v2 endpoint before it starts accepting traffic
+# Workers use gunicorn's threaded (gthread) worker class, since the default sync
+# worker ignores keep-alive
+WARMUP_REQUESTS = [
+    ("/Polypeptide/v2/", "AUGGCCAAGUAA"),
+    ("/CDNA/v2/", "AUGC"),
+    ("/RNA/v2/", "ATGC"),
+    ("/DNA/v2/", "ATGC"),
+]
+
+
+def warm_up_worker(worker):
+    client = worker.wsgi.test_client()
+    for path, seq in WARMUP_REQUESTS:
+        response = client.get(path, query_string={"seq": seq})
+        if response.status_code != 200:
+            worker.log.warning(
+                "Warm-up request %s returned %s", path, response.status_code
+            )
+
+
+def get_application(
+    host="0.0.0.0", port=5604, workers=None, threads=4, timeout=30, keepalive=2
+):
+    # gunicorn is only needed for production serving, so import it lazily
+    from gunicorn.app.base import BaseApplication
+
+    if workers is None:
+        workers = multiprocessing.cpu_count() * 2 + 1
+
+    class CDaaRApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", threads)
+            self.cfg.set("timeout", timeout)
+            self.cfg.set("keepalive", keepalive)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("post_worker_init", warm_up_worker)
+
+        def load(self):
+            return app
+
+    return CDaaRApplication()
+
+
+def serve(**options):
+    get_application(**options).run()
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5604)
+    parser = argparse.ArgumentParser(description="Central Dogma Transcription API")
+    subcommands = parser.add_subparsers(dest="command")
+    serve_parser = subcommands.add_parser(
+        "serve", help="Run the pre-forking production server"
+    )
+    serve_parser.add_argument("--host", default=os.environ.get("CDAAR_HOST", "0.0.0.0"))
+    serve_parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("CDAAR_PORT", 5604))
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.environ.get("CDAAR_WORKERS"),
+        help="Number of worker processes (default: 2 * CPU count + 1)",
+    )
+    serve_parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.environ.get("CDAAR_THREADS", 4)),
+        help="Number of threads per worker process",
+    )
+    serve_parser.add_argument(
+        "--timeout",
+        type=int,
+        default=int(os.environ.get("CDAAR_TIMEOUT", 30)),
+        help="Seconds before a silent worker is killed and restarted",
+    )
+    serve_parser.add_argument(
+        "--keepalive",
+        type=int,
+        default=int(os.environ.get("CDAAR_KEEPALIVE", 2)),
+        help="Seconds to wait for requests on a keep-alive connection",
+    )
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads=args.threads,
+            timeout=args.timeout,
+            keepalive=args.keepalive,
+        )
+    else:
+        app.run(debug=True, host="0.0.0.0", port=5604)
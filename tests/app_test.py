@@ -0,0 +1,145 @@
+import multiprocessing
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Translation_transcription import (
+    app,
+    get_application,
+    get_translate_mrna,
+    warm_up_worker,
+)
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_rna_transcription_window(client):
+    response = client.get(
+        "/RNA/v2/", query_string={"seq": "ATGCATGC", "offset": 2, "limit": 3}
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["Original"] == "GCA"
+    assert "GCA" in data["RNA_Transcription"]
+    assert data["Window"] == {"offset": 2, "length": 3, "total": 8}
+
+
+def test_dna_reverse_complement_window_out_of_range(client):
+    response = client.get("/DNA/v2/", query_string={"seq": "ATGC", "offset": 4})
+    assert response.status_code == 400
+    data = response.get_json()
+    assert "DNA error" in data
+
+
+def test_cdna_synthesis_window(client):
+    response = client.get(
+        "/CDNA/v2/", query_string={"seq": "AUGCUU", "offset": 1, "limit": 2}
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["Original"] == "UG"
+    assert data["Double_Stranded_CDNA"] == " 5'-TG-3' paired with 3'-AC-5' "
+    assert data["Window"] == {"offset": 1, "length": 2, "total": 6}
+
+
+def test_cdna_synthesis_window_out_of_range(client):
+    response = client.get("/CDNA/v2/", query_string={"seq": "AUGC", "offset": 4})
+    assert response.status_code == 400
+    data = response.get_json()
+    assert "CDNA error" in data
+
+
+def test_polypeptide_translation_window(client):
+    response = client.get(
+        "/Polypeptide/v2/",
+        query_string={"seq": "AUGGCCAAGUAA", "offset": 1, "limit": 1},
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["Codon"] == "GCC"
+    assert data["Polypeptide"]["polypeptide"] == ["Alanine"]
+    assert data["Polypeptide"]["length"] == 1
+    assert data["Window"] == {"offset": 1, "length": 1, "total": 3}
+
+
+def test_polypeptide_translation_window_limit_past_stop(client):
+    response = client.get(
+        "/Polypeptide/v2/",
+        query_string={"seq": "AUGGCCAAGUAAGGG", "offset": 1, "limit": 5},
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["Codon"] == "GCCAAG"
+    assert data["Polypeptide"]["polypeptide"] == ["Alanine", "Lysine"]
+    assert data["Window"] == {"offset": 1, "length": 2, "total": 3}
+
+
+def test_polypeptide_translation_window_past_stop(client):
+    response = client.get(
+        "/Polypeptide/v2/", query_string={"seq": "AUGGCCAAGUAA", "offset": 3}
+    )
+    assert response.status_code == 400
+    data = response.get_json()
+    assert "Offset" in data["mRNA error"]
+
+
+def test_polypeptide_translation_window_huge_offset(client):
+    response = client.get(
+        "/Polypeptide/v2/", query_string={"seq": "AUGGCC", "offset": 10**12}
+    )
+    assert response.status_code == 400
+    data = response.get_json()
+    assert "Offset" in data["mRNA error"]
+
+
+def test_translate_mrna_huge_offset_stops_at_sequence_end():
+    # the stop-codon scan is bounded by the sequence, not by the offset
+    result = get_translate_mrna("AUGGCC", 10**18)
+    assert "Offset" in result["error"]
+
+
+def test_translate_mrna_window_returns_total():
+    assert get_translate_mrna("AUGGCCAAGUAA", 1, 1) == {
+        "polypeptide": ["Alanine"],
+        "length": 1,
+        "total": 3,
+    }
+    assert "total" not in get_translate_mrna("AUGGCCAAGUAA")
+
+
+def test_transform_routes_without_window_are_unchanged(client):
+    for path, seq in [
+        ("/RNA/v2/", "ATGC"),
+        ("/DNA/v2/", "ATGC"),
+        ("/CDNA/v2/", "AUGC"),
+    ]:
+        response = client.get(path, query_string={"seq": seq})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["Original"] == seq
+        assert "Window" not in data
+
+
+def test_warm_up_worker_requests_succeed():
+    worker = SimpleNamespace(wsgi=app, log=Mock())
+    warm_up_worker(worker)
+    worker.log.warning.assert_not_called()
+
+
+def test_serve_application_config():
+    pytest.importorskip("gunicorn")
+    application = get_application()
+    assert application.cfg.preload_app is True
+    assert application.cfg.post_worker_init is warm_up_worker
+    assert application.cfg.workers == multiprocessing.cpu_count() * 2 + 1
+    assert application.cfg.worker_class_str == "gthread"
+    assert application.cfg.threads == 4
+    assert application.cfg.keepalive == 2